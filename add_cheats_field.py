@@ -7,34 +7,57 @@
 
 import json
 import os
-from pathlib import Path
+
+try:
+    # 可选依赖：orjson 用原生代码编解码，比标准库 json 快数倍
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def load_json(path):
+    """读取 JSON 文件，优先使用 orjson"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def dump_json(data, path):
+    """写出 JSON 文件（indent=2），优先使用 orjson"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
 
 
 def add_cheats_field(games_json_path, cheats_dir):
     """为games.json添加cheats字段，放在description之前"""
-    
+
     # 读取games.json
-    with open(games_json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
+    data = load_json(games_json_path)
+
     games = data.get('games', [])
     print(f"找到 {len(games)} 个游戏")
     
     # 获取cheats目录下的所有cht文件名（不含扩展名）
-    cht_files = set()
-    for f in Path(cheats_dir).glob('*.cht'):
-        cht_files.add(f.stem)
+    # scandir 一次系统调用拿到目录项，且不像 glob 那样逐项 stat
+    with os.scandir(cheats_dir) as it:
+        cht_files = {os.path.splitext(e.name)[0]
+                     for e in it if e.name.endswith('.cht') and e.is_file()}
     print(f"找到 {len(cht_files)} 个金手指文件")
     
     # 统计
     with_cheats = 0
     without_cheats = 0
-    
+
     # 为每个游戏添加cheats字段
-    new_games = []
     for game in games:
         game_name = game.get('name', '')
-        
+
         # 确定cheats值
         if game_name in cht_files:
             cheats_value = f"/cheats/{game_name}.cht"
@@ -42,26 +65,22 @@ def add_cheats_field(games_json_path, cheats_dir):
         else:
             cheats_value = ""
             without_cheats += 1
-        
-        # 重新构建game对象，确保cheats在description之前
-        new_game = {}
-        for key in game:
-            if key == 'description':
-                new_game['cheats'] = cheats_value
-            new_game[key] = game[key]
-        
-        # 如果没有description字段，在末尾添加cheats
-        if 'cheats' not in new_game:
-            new_game['cheats'] = cheats_value
-        
-        new_games.append(new_game)
-    
-    data['games'] = new_games
-    
-    # 保存更新后的games.json
-    with open(games_json_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-    
+
+        # 已有cheats字段时直接覆盖；否则在description之前插入一次
+        if 'cheats' in game:
+            game['cheats'] = cheats_value
+            continue
+
+        items = list(game.items())
+        idx = next((i for i, (key, _) in enumerate(items) if key == 'description'),
+                   len(items))
+        items.insert(idx, ('cheats', cheats_value))
+        game.clear()
+        game.update(items)
+
+    # 保存更新后的games.json（indent=2 足够可读，文件体积减半）
+    dump_json(data, games_json_path)
+
     print(f"\n=== 完成 ===")
     print(f"有金手指: {with_cheats} 个游戏")
     print(f"无金手指: {without_cheats} 个游戏")
@@ -4,49 +4,42 @@
 复制到 public/cheats 目录下，并重命名为 games.name.cht
 """
 
+import bisect
 import json
 import os
 import shutil
 import re
 import pandas as pd
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 
+# 预编译热点正则，避免每次调用都经过 re 模块的缓存查找
+# 单个交替模式一趟完成：去掉括号/方括号内容，再滤掉所有非字母数字字符
+_CLEAN_RE = re.compile(r'\([^)]*\)|\[[^\]]*\]|[^a-z0-9]')
+_CN_SEP_RE = re.compile(r'[；;]')
+
+
+@lru_cache(maxsize=None)
 def normalize_name(name: str) -> str:
-    """标准化游戏名称，用于匹配"""
-    if not name or pd.isna(name):
+    """标准化游戏名称，用于匹配（同名反复出现，结果按入参缓存）"""
+    if not name:
         return ""
-    # 移除特殊字符，转为小写
-    name = str(name).lower()
-    # 移除括号内的内容
-    name = re.sub(r'\([^)]*\)', '', name)
-    name = re.sub(r'\[[^\]]*\]', '', name)
-    # 只保留字母数字
-    name = re.sub(r'[^a-z0-9]', '', name)
-    return name
-
-
-def extract_english_names(name_en: str) -> list:
-    """从英文名称字段提取所有可能的英文名"""
-    if not name_en or pd.isna(name_en):
-        return []
-    # 使用 ; 分隔多个名称
-    names = [n.strip() for n in str(name_en).split(';')]
-    # 移除空名称和方括号标记的别名
-    names = [n for n in names if n and not n.startswith('[')]
-    return names
+    return _CLEAN_RE.sub('', str(name).lower())
 
 
-def extract_chinese_names(name_cn: str) -> list:
-    """从中文名称字段提取所有可能的中文名"""
-    if not name_cn or pd.isna(name_cn):
-        return []
-    # 使用 ； 或 ; 分隔多个名称
-    names = re.split(r'[；;]', str(name_cn))
-    names = [n.strip() for n in names]
+def extract_names(series: "pd.Series", sep) -> "pd.Series":
+    """整列向量化拆分名称字段：按分隔符切开、去空白，过滤空串和方括号别名
+
+    入参列须已清理为纯字符串（见 build_name_mapping 里的统一 fillna）
+    """
+    names = (series.str.split(sep, regex=True)
+             .explode()
+             .str.strip())
     # 移除空名称和方括号标记的别名
-    names = [n for n in names if n and not n.startswith('[')]
-    return names
+    return names[(names != '') & ~names.str.startswith('[')]
 
 
 def build_name_mapping(excel_path: str) -> dict:
@@ -55,66 +48,67 @@ def build_name_mapping(excel_path: str) -> dict:
     返回: {normalized_chinese_name: [english_names]}
     """
     df = pd.read_excel(excel_path, skiprows=1)
-    mapping = {}
-    
-    for _, row in df.iterrows():
-        chinese_names = extract_chinese_names(row.get('name_cn', ''))
-        english_names = extract_english_names(row.get('name_en', ''))
-        
-        if not english_names:
-            continue
-            
+    # NaN 读入后统一清理一次，热点路径上不再做逐值的 pandas 类型判定
+    df[['name_cn', 'name_en']] = df[['name_cn', 'name_en']].fillna('').astype(str)
+    mapping = defaultdict(list)
+
+    # 两列整体拆分后按原行号聚回列表，拆分/过滤都在 pandas 的 C 实现里完成
+    cn_lists = extract_names(df['name_cn'], _CN_SEP_RE).groupby(level=0).agg(list)
+    en_lists = extract_names(df['name_en'], ';').groupby(level=0).agg(list)
+
+    for idx, english_names in en_lists.items():
+        chinese_names = cn_lists.get(idx, [])
+
         for cn_name in chinese_names:
             normalized = normalize_name(cn_name)
             if normalized:
-                if normalized not in mapping:
-                    mapping[normalized] = []
                 mapping[normalized].extend(english_names)
-                
+
         # 也用原始中文名作为key
         for cn_name in chinese_names:
             if cn_name:
-                if cn_name not in mapping:
-                    mapping[cn_name] = []
                 mapping[cn_name].extend(english_names)
-    
-    return mapping
 
+    return dict(mapping)
 
-def find_cheat_file(english_names: list, cheats_dir: str, cheat_files: list):
-    """
-    在cheats目录中查找匹配的cht文件
-    返回匹配的文件名
-    
-    匹配优先级：
-    1. 完全匹配（标准化后）
-    2. 英文名在cheat文件名开头（标准化后）
-    """
-    # 预处理cheat文件名
+
+def build_cheat_mapping(cheat_files: list) -> dict:
+    """预处理cheat文件名，构建 {标准化文件名: 文件名} 映射（整个运行只做一次）"""
     cheat_mapping = {}
     for cheat_file in cheat_files:
         cheat_base = os.path.splitext(cheat_file)[0]
         normalized_cheat = normalize_name(cheat_base)
         if normalized_cheat:
             cheat_mapping[normalized_cheat] = cheat_file
-    
+    return cheat_mapping
+
+
+def find_cheat_file(english_names: list, cheat_mapping: dict, sorted_keys: list):
+    """
+    在cheat文件名映射中查找匹配的cht文件
+    返回匹配的文件名
+
+    匹配优先级：
+    1. 完全匹配（标准化后）
+    2. 英文名在cheat文件名开头（标准化后）
+    """
     # 第一轮：精确匹配
     for en_name in english_names:
         normalized_en = normalize_name(en_name)
         if normalized_en and normalized_en in cheat_mapping:
             return cheat_mapping[normalized_en]
-    
+
     # 第二轮：英文名作为cheat文件名的前缀匹配
+    # 键已排序，用二分定位首个候选，省去整表扫描
     for en_name in english_names:
         normalized_en = normalize_name(en_name)
         if not normalized_en or len(normalized_en) < 5:  # 名称太短，跳过前缀匹配
             continue
-        
-        for normalized_cheat, cheat_file in cheat_mapping.items():
-            # 检查cheat文件名是否以英文名开头
-            if normalized_cheat.startswith(normalized_en):
-                return cheat_file
-    
+
+        i = bisect.bisect_left(sorted_keys, normalized_en)
+        if i < len(sorted_keys) and sorted_keys[i].startswith(normalized_en):
+            return cheat_mapping[sorted_keys[i]]
+
     return None
 
 
@@ -134,8 +128,13 @@ def copy_cheats(games_json_path: str, excel_path: str, cheats_dir: str, output_d
     print(f"构建了 {len(name_mapping)} 个名称映射")
     
     # 获取cheats目录下的所有cht文件
-    cheat_files = [f for f in os.listdir(cheats_dir) if f.endswith('.cht')]
+    with os.scandir(cheats_dir) as it:
+        cheat_files = [e.name for e in it if e.name.endswith('.cht') and e.is_file()]
     print(f"找到 {len(cheat_files)} 个cheat文件")
+
+    # 预处理一次cheat文件名映射，供所有游戏复用；排序后的键用于前缀二分查找
+    cheat_mapping = build_cheat_mapping(cheat_files)
+    sorted_cheat_keys = sorted(cheat_mapping)
     
     # 创建输出目录
     if not dry_run:
@@ -145,29 +144,25 @@ def copy_cheats(games_json_path: str, excel_path: str, cheats_dir: str, output_d
     found_count = 0
     not_found = []
     copied_files = []
-    
+    copy_pairs = []
+
+    # 预先解析每个游戏的候选英文名：先按原名直查，再按标准化名查
+    game_entries = []
     for game in games:
         game_name = game.get('name', '')
         if not game_name:
             continue
-        
-        # 尝试在映射中查找
-        english_names = []
-        
-        # 直接查找
-        if game_name in name_mapping:
-            english_names = name_mapping[game_name]
-        else:
-            # 标准化查找
-            normalized = normalize_name(game_name)
-            if normalized in name_mapping:
-                english_names = name_mapping[normalized]
-        
+        english_names = name_mapping.get(game_name)
+        if english_names is None:
+            english_names = name_mapping.get(normalize_name(game_name), [])
+        game_entries.append((game_name, english_names))
+
+    for game_name, english_names in game_entries:
         # 查找对应的cheat文件
         cheat_file = None
         if english_names:
-            cheat_file = find_cheat_file(english_names, cheats_dir, cheat_files)
-        
+            cheat_file = find_cheat_file(english_names, cheat_mapping, sorted_cheat_keys)
+
         if cheat_file:
             found_count += 1
             src_path = os.path.join(cheats_dir, cheat_file)
@@ -176,9 +171,9 @@ def copy_cheats(games_json_path: str, excel_path: str, cheats_dir: str, output_d
             if dry_run:
                 print(f"[DRY RUN] 复制: {cheat_file} -> {game_name}.cht")
             else:
-                shutil.copy2(src_path, dst_path)
+                copy_pairs.append((src_path, dst_path))
                 print(f"复制: {cheat_file} -> {game_name}.cht")
-            
+
             copied_files.append({
                 'game_name': game_name,
                 'source': cheat_file,
@@ -186,7 +181,12 @@ def copy_cheats(games_json_path: str, excel_path: str, cheats_dir: str, output_d
             })
         else:
             not_found.append(game_name)
-    
+
+    # 匹配完成后统一并发复制：copy2 复制时释放 GIL，多线程能真正重叠磁盘 I/O
+    if copy_pairs:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda pair: shutil.copy2(*pair), copy_pairs))
+
     print(f"\n=== 统计 ===")
     print(f"找到并复制: {found_count} 个")
     print(f"未找到: {len(not_found)} 个")
@@ -3,143 +3,237 @@
 翻译 public/cheats 目录下所有 .cht 文件中的 cheat*_desc 英文描述为中文
 """
 
+import atexit
+import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from deep_translator import GoogleTranslator
 
 
-def translate_text(text, retries=3):
-    """翻译文本，带重试机制"""
-    print(f"    正在翻译: {text[:50]}...", end=" ", flush=True)
+# 每个线程复用自己的翻译器实例：GoogleTranslator 发请求前会改写实例内部状态，
+# 跨线程共享一个实例会把别的线程的文本发出去，导致译文串台
+_thread_local = threading.local()
+
+
+def get_translator():
+    if not hasattr(_thread_local, 'translator'):
+        _thread_local.translator = GoogleTranslator(source='en', target='zh-CN')
+    return _thread_local.translator
+
+# 跨运行的持久化翻译缓存：相同的英文描述只请求一次
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translation_cache.json')
+CACHE_FLUSH_EVERY = 50
+
+try:
+    with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+        CACHE = json.load(f)
+except (FileNotFoundError, json.JSONDecodeError):
+    CACHE = {}
+
+_cache_pending = 0
+_cache_lock = threading.Lock()
+
+
+def save_cache():
+    """把缓存写回磁盘（仅在有新增条目时）
+
+    持锁完成整个写入，避免并发落盘互相截断；先写临时文件再原子替换，
+    中途退出也不会留下残缺的缓存文件
+    """
+    global _cache_pending
+    with _cache_lock:
+        if _cache_pending == 0:
+            return
+        tmp_path = CACHE_PATH + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(CACHE, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, CACHE_PATH)
+        _cache_pending = 0
+
+
+atexit.register(save_cache)
+
+
+def _translate_batch(texts, retries=3):
+    """一次批量请求翻译，带重试机制，返回与输入顺序对应的结果列表
+
+    翻译失败的条目返回 None，由调用方决定如何处理
+    """
+    print(f"    正在批量翻译 {len(texts)} 条描述...", end=" ", flush=True)
     for attempt in range(retries):
         try:
-            translator = GoogleTranslator(source='en', target='zh-CN')
-            result = translator.translate(text)
-            if result:
-                print(f"-> {result[:50]}...")
-                return result
-            else:
-                print("-> [保持原文]")
-                return text
+            results = get_translator().translate_batch(list(texts))
+            print("完成")
+            return [r if r else None for r in results]
         except Exception as e:
             if attempt < retries - 1:
                 print(f"[重试{attempt+1}]", end=" ", flush=True)
                 time.sleep(1)
             else:
-                print(f"-> [翻译失败: {e}]")
-                return text
-    return text
+                print(f"[翻译失败: {e}]")
+                return [None] * len(texts)
+    return [None] * len(texts)
+
+
+def translate_texts(texts, retries=3):
+    """批量翻译文本，优先查本地缓存，只把缓存未命中的部分发给翻译接口
+
+    翻译失败的条目保持原文返回，且不写入缓存，下次运行会重试
+    """
+    global _cache_pending
+    misses = [t for t in texts if t not in CACHE]
+    if misses:
+        results = _translate_batch(misses, retries=retries)
+        # 只缓存成功的翻译，失败的留待下次重试
+        translated = {t: r for t, r in zip(misses, results) if r is not None}
+        if translated:
+            with _cache_lock:
+                CACHE.update(translated)
+                _cache_pending += len(translated)
+                flush = _cache_pending >= CACHE_FLUSH_EVERY
+            # 每积累若干条新翻译就落盘一次，避免中途退出丢失结果
+            if flush:
+                save_cache()
+    return [CACHE.get(t, t) for t in texts]
+
+
+def has_cjk(text):
+    """判断文本是否含中文字符（逐字符区间比较，免去每行一次正则）"""
+    return any(0x4e00 <= ord(c) <= 0x9fff for c in text)
 
 
 def translate_cht_file(file_path, dry_run=True):
     """翻译单个 .cht 文件中的描述"""
-    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-    
-    # 匹配 cheat*_desc = "..." 格式
-    desc_pattern = re.compile(r'^(cheat\d+_desc\s*=\s*)"(.+)"$')
-    
-    modified = False
-    new_lines = []
-    translations = []
-    
+    # 先按字节做一次包含测试：完全没有描述行的文件连解码都省掉
+    data = Path(file_path).read_bytes()
+    if b'_desc' not in data:
+        return []
+
+    lines = data.decode('utf-8', errors='ignore').splitlines(keepends=True)
+
+    # 匹配 cheat*_desc = "..." 格式（直接匹配原始行，免去 strip 拷贝）
+    desc_pattern = re.compile(r'^\s*(cheat\d+_desc\s*=\s*)"(.+)"\s*$')
+
+    # 第一遍：收集待翻译的英文描述（去重，保持出现顺序）
+    pending = {}
     for line in lines:
-        match = desc_pattern.match(line.strip())
+        # 廉价的子串预判：不含 _desc 的行不可能匹配，跳过正则
+        if '_desc' not in line:
+            continue
+        match = desc_pattern.match(line)
         if match:
-            prefix = match.group(1)
             english_desc = match.group(2)
-            
-            # 检查是否已经是中文（包含中文字符）
-            if re.search(r'[\u4e00-\u9fff]', english_desc):
-                new_lines.append(line)
-                continue
-            
-            # 翻译
-            chinese_desc = translate_text(english_desc)
-            
-            if chinese_desc != english_desc:
-                translations.append((english_desc, chinese_desc))
-                # 保持原始行的缩进
-                leading_space = len(line) - len(line.lstrip())
-                new_line = ' ' * leading_space + f'{prefix}"{chinese_desc}"\n'
-                new_lines.append(new_line)
-                modified = True
-            else:
-                new_lines.append(line)
-        else:
-            new_lines.append(line)
-    
-    if modified and not dry_run:
+            # 跳过已经是中文的描述（包含中文字符）
+            if not has_cjk(english_desc):
+                pending[english_desc] = None
+
+    # 整个文件一次批量翻译
+    if pending:
+        results = translate_texts(list(pending))
+        pending = dict(zip(pending, results))
+
+    translations = []
+    modifications = []
+
+    # 第二遍：只记录有变化的行，未改动的行不重建
+    for idx, line in enumerate(lines):
+        if '_desc' not in line:
+            continue
+        match = desc_pattern.match(line)
+        if not match:
+            continue
+
+        prefix = match.group(1)
+        english_desc = match.group(2)
+        chinese_desc = pending.get(english_desc, english_desc)
+
+        if chinese_desc != english_desc:
+            translations.append((english_desc, chinese_desc))
+            # 保持原始行的缩进
+            leading_space = len(line) - len(line.lstrip())
+            modifications.append((idx, ' ' * leading_space + f'{prefix}"{chinese_desc}"\n'))
+
+    # 无改动的文件（大多数）直接返回，不做任何重写
+    if not modifications:
+        return []
+
+    if not dry_run:
+        for idx, new_line in modifications:
+            lines[idx] = new_line
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.writelines(new_lines)
-    
+            f.write(''.join(lines))
+
     return translations
 
 
-def translate_all_cheats(cheats_dir, dry_run=True, limit=None):
+def translate_all_cheats(cheats_dir, dry_run=True, limit=None, max_workers=8):
     """翻译目录下所有 .cht 文件"""
     cht_files = list(Path(cheats_dir).glob('*.cht'))
     print(f"找到 {len(cht_files)} 个 .cht 文件")
-    
+
     if limit:
         cht_files = cht_files[:limit]
         print(f"限制处理前 {limit} 个文件")
-    
+
     total_translations = 0
     processed_files = 0
-    
-    for i, cht_file in enumerate(cht_files, 1):
-        print(f"\n[{i}/{len(cht_files)}] 正在处理: {cht_file.name}")
-        
-        try:
-            translations = translate_cht_file(str(cht_file), dry_run=dry_run)
-            
-            if translations:
-                total_translations += len(translations)
-                processed_files += 1
-                print(f"  ✓ 已翻译 {len(translations)} 条描述")
-            else:
-                print(f"  - 无需翻译（已是中文或无描述）")
-                
-            # 添加延时避免API限制
-            if translations:
-                time.sleep(0.3)
-                
-        except Exception as e:
-            print(f"  ✗ 错误: {e}")
-    
+
+    # 翻译主要在等网络，多个文件并发处理；worker 数不宜过大，避免触发 API 限流
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(translate_cht_file, str(f), dry_run): f
+                   for f in cht_files}
+
+        for i, future in enumerate(as_completed(futures), 1):
+            cht_file = futures[future]
+            print(f"\n[{i}/{len(cht_files)}] 已处理: {cht_file.name}")
+
+            try:
+                translations = future.result()
+
+                if translations:
+                    total_translations += len(translations)
+                    processed_files += 1
+                    print(f"  ✓ 已翻译 {len(translations)} 条描述")
+                else:
+                    print(f"  - 无需翻译（已是中文或无描述）")
+
+            except Exception as e:
+                print(f"  ✗ 错误: {e}")
+
     print(f"\n{'='*50}")
     print(f"=== 翻译完成 ===")
     print(f"处理文件数: {len(cht_files)}")
     print(f"翻译文件数: {processed_files}")
     print(f"总共翻译描述: {total_translations} 条")
     print(f"{'='*50}")
-    
+
     if dry_run:
         print("\n这是模拟运行，文件未被修改。使用 --execute 参数实际执行。")
 
 
 if __name__ == "__main__":
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='翻译CHT文件中的英文描述为中文')
     parser.add_argument('--dry-run', action='store_true', help='仅显示将要执行的操作，不实际修改文件')
     parser.add_argument('--execute', action='store_true', help='实际执行翻译操作')
     parser.add_argument('--limit', type=int, help='限制处理的文件数量（用于测试）')
-    
+
     args = parser.parse_args()
-    
+
     # 路径配置
     base_dir = os.path.dirname(os.path.abspath(__file__))
     cheats_dir = os.path.join(base_dir, 'public', 'cheats')
-    
+
     dry_run = not args.execute
-    
+
     if dry_run:
         print("=== 模拟运行模式 (使用 --execute 参数实际执行) ===\n")
     else:
         print("=== 实际执行模式 ===\n")
-    
+
     translate_all_cheats(cheats_dir, dry_run=dry_run, limit=args.limit)